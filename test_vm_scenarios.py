@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+Offline test scenarios for the Dynamic VM Management System
+Exercises VMPoolManager logic against mock Proxmox/Guacamole backends,
+so no real servers are needed (see test_vm_manager.py for live tests)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from vm_manager import DynamicVMService
+
+try:
+    # C JSON parser; noticeably faster on the small config reads that
+    # happen at every suite startup
+    import orjson
+    _loads = orjson.loads
+    _JSONDecodeError = (orjson.JSONDecodeError, json.JSONDecodeError)
+except ImportError:
+    _loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+# Self-contained config for offline runs; written to test_config.json so
+# the service loads it through its normal ConfigManager path
+TEST_CONFIG = {
+    "server": {
+        "port": 3000,
+        "host": "0.0.0.0",
+        "log_level": "INFO",
+        "log_file": "/tmp/test_vm_service.log"
+    },
+    "proxmox": {
+        "host": "https://proxmox.test:8006",
+        "username": "test@pam",
+        "password": "test",
+        "node": "testnode",
+        "template_vm_id": 1000,
+        "storage": "local-lvm",
+        "verify_ssl": False
+    },
+    "guacamole": {
+        "host": "http://guacamole.test:8080/guacamole",
+        "username": "guacadmin",
+        "password": "guacadmin",
+        "data_source": "mysql"
+    },
+    "vm": {
+        "base_load": 2,
+        "users_per_vm": 3,
+        "max_vms": 5,
+        "check_interval": 2,
+        "state_file": "/tmp/coddash_test_pool_state.json",
+        "cpu": 2,
+        "memory": 2048,
+        "disk": "16G",
+        "health_check_timeout": 60
+    },
+    "network": {
+        "base_ip": "192.168.100.10",
+        "subnet": "192.168.100.0/24",
+        "gateway": "192.168.100.1",
+        "dns": "8.8.8.8",
+        "dhcp_range_start": "192.168.100.200",
+        "dhcp_range_end": "192.168.100.250"
+    },
+    "monitoring": {
+        "enable_health_checks": True,
+        "health_check_interval": 5,
+        "max_vm_creation_attempts": 3,
+        "vm_ready_timeout": 30
+    }
+}
+
+TEST_CONFIG_PATH = "test_config.json"
+
+# Configure logging once at import; per-runner basicConfig calls would
+# install duplicate handlers when several runners share the process
+if not logging.getLogger().handlers:
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+
+def write_test_config(path=TEST_CONFIG_PATH):
+    """Write the test configuration file used by the scenarios"""
+    with open(path, 'w') as f:
+        json.dump(TEST_CONFIG, f, indent=2)
+
+
+def validate_config(config_path=TEST_CONFIG_PATH):
+    """Validate the test configuration file before running scenarios
+
+    Returns (ok, config) so callers can reuse the parsed dict instead of
+    re-reading the file.
+    """
+    try:
+        with open(config_path, 'rb') as f:
+            config = _loads(f.read())
+    except FileNotFoundError:
+        print(f"Configuration file not found: {config_path}")
+        return False, None
+    except _JSONDecodeError as e:
+        print(f"Invalid JSON in configuration file: {e}")
+        return False, None
+
+    # Set differences: one hash pass per section instead of per-key scans
+    missing = {'proxmox', 'guacamole', 'vm', 'network',
+               'monitoring'} - config.keys()
+    if missing:
+        print(f"✗ Missing required configuration sections: {sorted(missing)}")
+        return False, None
+
+    missing = {'host', 'username', 'password', 'node',
+               'template_vm_id'} - config['proxmox'].keys()
+    if missing:
+        print(f"✗ Missing required Proxmox configuration: {sorted(missing)}")
+        return False, None
+
+    missing = {'base_load', 'users_per_vm', 'max_vms',
+               'check_interval'} - config['vm'].keys()
+    if missing:
+        print(f"✗ Missing required VM configuration: {sorted(missing)}")
+        return False, None
+
+    print(f"✓ Configuration valid: {config_path}")
+    return True, config
+
+
+@dataclass(slots=True)
+class MockVMRecord:
+    """Compact per-VM record; ~3x smaller than a dict per VM"""
+    vmid: int
+    name: str
+    status: str
+    ip: Optional[str] = None
+    template: int = 0
+
+
+class MockProxmoxManager:
+    """In-memory stand-in for ProxmoxManager"""
+
+    def __init__(self, config, logger):
+        self.config = config
+        self.logger = logger
+        self.vms = {}
+        # Shared view of the VM records; clone appends and start/stop
+        # mutate in place, so list_vms never rebuilds a row per VM
+        self._vm_summary_view = []
+        self._summaries = {}
+        # Simulated API latency, off by default so correctness runs don't
+        # spend their time sleeping; set MOCK_SIM_LATENCY to exercise it
+        self._sim_latency = float(os.environ.get("MOCK_SIM_LATENCY", "0"))
+        self._initialize_test_vms()
+
+    def _register_vm(self, record):
+        self.vms[record.vmid] = record
+        # Callers consume dict rows, so keep a per-VM summary dict that
+        # start/stop update alongside the record
+        summary = {'vmid': record.vmid, 'status': record.status,
+                   'name': record.name}
+        self._summaries[record.vmid] = summary
+        self._vm_summary_view.append(summary)
+
+    def _set_status(self, record, status):
+        record.status = status
+        self._summaries[record.vmid]['status'] = status
+
+    def _initialize_test_vms(self):
+        template_id = self.config['proxmox']['template_vm_id']
+        self._register_vm(MockVMRecord(
+            vmid=template_id,
+            name='test-template',
+            status='stopped',
+            template=1
+        ))
+
+    async def initialize(self):
+        self.logger.info("Mock Proxmox manager initialized")
+
+    async def clone_vm(self, template_vm_id, new_vm_id, name, ip_config):
+        if self._sim_latency:
+            await asyncio.sleep(self._sim_latency)
+        self._register_vm(MockVMRecord(
+            vmid=new_vm_id,
+            name=name,
+            status='running',
+            ip=ip_config.get('ip')
+        ))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Mock: Cloned VM %s from template %s",
+                              new_vm_id, template_vm_id)
+        return True
+
+    async def start_vm(self, vm_id):
+        record = self.vms.get(vm_id)
+        if record:
+            self._set_status(record, 'running')
+            self.logger.debug("Mock: Started VM %s", vm_id)
+            return True
+        return False
+
+    async def stop_vm(self, vm_id):
+        record = self.vms.get(vm_id)
+        if record:
+            self._set_status(record, 'stopped')
+            self.logger.debug("Mock: Stopped VM %s", vm_id)
+            return True
+        return False
+
+    async def get_vm_status(self, vm_id):
+        record = self.vms.get(vm_id)
+        if record:
+            return {'status': record.status, 'vmid': vm_id, 'name': record.name}
+        return {}
+
+    async def list_vms(self):
+        return self._vm_summary_view
+
+    async def close(self):
+        self.logger.info("Mock Proxmox manager closed")
+
+
+class MockGuacamoleManager:
+    """In-memory stand-in for GuacamoleManager"""
+
+    def __init__(self, config, logger):
+        self.config = config
+        self.logger = logger
+        self.connections = {}
+        self.connection_counter = 0
+        self._sim_latency = float(os.environ.get("MOCK_SIM_LATENCY", "0"))
+        # Connections with a simulated live session, maintained on
+        # insert/delete so activeness is never recomputed per query
+        self._active_ids = set()
+
+    async def initialize(self):
+        self.logger.info("Mock Guacamole manager initialized")
+
+    async def create_connection(self, vm_config):
+        if self._sim_latency:
+            await asyncio.sleep(self._sim_latency)
+        self.connection_counter += 1
+        connection_id = f"mock-conn-{self.connection_counter}"
+        self.connections[connection_id] = {
+            'name': vm_config['name'],
+            'ip': vm_config['ip'],
+            'created_at': time.time()
+        }
+        # Every third connection gets a simulated session, decided once
+        # at creation instead of re-hashing every id on each query
+        if self.connection_counter % 3 == 0:
+            self._active_ids.add(connection_id)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Mock: Created Guacamole connection %s for %s",
+                              connection_id, vm_config['name'])
+        return connection_id
+
+    async def delete_connection(self, connection_id):
+        if connection_id in self.connections:
+            del self.connections[connection_id]
+            self._active_ids.discard(connection_id)
+            self.logger.debug("Mock: Deleted Guacamole connection %s", connection_id)
+            return True
+        return False
+
+    async def get_active_connections(self):
+        return {
+            f"session-{i}": {
+                'connectionIdentifier': conn_id,
+                'username': f"user{i}",
+                'startDate': self.connections[conn_id]['created_at']
+            }
+            for i, conn_id in enumerate(self._active_ids, start=1)
+        }
+
+    async def refresh_connection_usage(self):
+        return {conn_id: 1 for conn_id in self._active_ids}
+
+    async def get_connection_usage(self, connection_id):
+        return 1 if connection_id in self._active_ids else 0
+
+    async def close(self):
+        self.logger.info("Mock Guacamole manager closed")
+
+
+class TestScenarioRunner:
+    """Runs end-to-end scenarios against a mock-backed DynamicVMService"""
+
+    def __init__(self, config_path=TEST_CONFIG_PATH, config=None):
+        self.config_path = config_path
+        self.config = config
+        self.setup_logging()
+        self.results = {}
+        # Shared service for scenarios that don't need a cold start
+        self.service = None
+
+    def setup_logging(self):
+        # Handlers are installed once at module scope; runners just grab
+        # the shared named logger
+        self.logger = logging.getLogger('TestRunner')
+
+    async def _start_service(self):
+        """Build a DynamicVMService wired to mock backends"""
+        service = DynamicVMService(self.config_path, config=self.config)
+        pool = service.vm_pool_manager
+        pool.proxmox_manager = MockProxmoxManager(service.config, self.logger)
+        pool.guacamole_manager = MockGuacamoleManager(service.config, self.logger)
+        await pool.initialize()
+        service.is_running = True
+        return service
+
+    async def setup_service(self):
+        """Construct the shared service exactly once"""
+        if self.service is None:
+            self.service = await self._start_service()
+
+    async def teardown_service(self):
+        if self.service is not None:
+            await self.service.stop()
+            self.service = None
+
+    async def run_scenario(self, name, scenario_func, reset_between=True):
+        print(f"\nScenario: {name} starting")
+
+        if reset_between:
+            # Cold start: a private service instance, torn down afterwards
+            service = await self._start_service()
+        else:
+            # Warm start: reuse the shared service and just reset pool
+            # state, skipping the stop/initialize cycle that dominates
+            # short scenarios
+            await self.setup_service()
+            await self.service.reset()
+            service = self.service
+        try:
+            await scenario_func(service)
+            self.results[name] = 'PASSED'
+            print(f"✓ Scenario '{name}' passed")
+        except Exception as e:
+            self.results[name] = f'FAILED: {e}'
+            print(f"✗ Scenario '{name}' failed: {e}")
+        finally:
+            if reset_between:
+                await service.stop()
+
+    async def scenario_basic_lifecycle(self, service):
+        """Assign users, check status, release users"""
+        # Wait until the base pool is actually provisioned
+        await asyncio.wait_for(
+            service.vm_pool_manager.ready_event.wait(), timeout=30)
+
+        status = await service.get_service_status(ttl_ms=500)
+        print(f"Initial Status: {status['pool']['total_vms']} VMs, "
+              f"{status['pool']['total_users']} users")
+
+        # Assign a batch of users concurrently; gather yields to the event
+        # loop between awaits, so no pacing sleeps are needed
+        users_to_test = 5
+        assignments = [
+            a for a in await asyncio.gather(
+                *(service.assign_user_vm() for _ in range(users_to_test))
+            ) if a
+        ]
+        print(f"Assigned {len(assignments)}/{users_to_test} users")
+        if not assignments:
+            raise Exception("No users could be assigned")
+
+        # Fresh read: a TTL'd read here could return the pre-assignment
+        # snapshot and hide the very mutation this step verifies
+        status = await service.get_service_status()
+        print(f"Status after assignment: {status['pool']['total_vms']} VMs, "
+              f"{status['pool']['total_users']} users")
+
+        # Release half of the assigned users in one batch
+        vms_to_release = assignments[:len(assignments) // 2]
+        await asyncio.gather(
+            *(service.release_user_vm(a['vm_id']) for a in vms_to_release))
+        print(f"Released {len(vms_to_release)} users")
+
+        # One snapshot serves both print blocks below
+        status = await service.get_service_status()
+        print(f"Updated Status: {status['pool']['total_vms']} VMs, "
+              f"{status['pool']['total_users']} users")
+
+        print("Detailed VM Status:")
+        for vm in status['pool']['vms']:
+            print(f"  - VM {vm['id']}: {vm['status']} ({vm['user_count']} users)")
+
+    async def scenario_capacity_limits(self, service):
+        """Drive the pool past its configured capacity"""
+        # Wait until the base pool is actually provisioned
+        await asyncio.wait_for(
+            service.vm_pool_manager.ready_event.wait(), timeout=30)
+
+        config = service.config
+        capacity = config['vm']['max_vms'] * config['vm']['users_per_vm']
+        users_to_test = capacity + 5
+
+        results = await asyncio.gather(
+            *(service.assign_user_vm() for _ in range(users_to_test)),
+            return_exceptions=True
+        )
+        assigned = [r for r in results if isinstance(r, dict)]
+        rejected = users_to_test - len(assigned)
+        print(f"Assigned {len(assigned)} users, rejected {rejected} "
+              f"(configured capacity: {capacity})")
+
+        if len(assigned) > capacity:
+            raise Exception(
+                f"Pool oversubscribed: {len(assigned)} users > capacity {capacity}")
+        if rejected == 0:
+            raise Exception("Expected some assignments to be rejected at capacity")
+
+        status = await service.get_service_status()
+        if status['pool']['total_vms'] > config['vm']['max_vms']:
+            raise Exception(
+                f"Pool exceeded max_vms: {status['pool']['total_vms']}")
+
+    async def scenario_error_recovery(self, service):
+        """Rapid assign/release churn should leave the pool stable"""
+        # Wait until the base pool is actually provisioned
+        await asyncio.wait_for(
+            service.vm_pool_manager.ready_event.wait(), timeout=30)
+
+        # Churn in two parallel batches: assign everything, then release
+        # everything; the sequential version only needed pacing sleeps
+        # because it held the loop between each pair
+        assignments = await asyncio.gather(
+            *(service.assign_user_vm() for _ in range(10)))
+        await asyncio.gather(
+            *(service.release_user_vm(a['vm_id']) for a in assignments if a))
+
+        status = await service.get_service_status()
+        if status['pool']['total_users'] != 0:
+            raise Exception(
+                f"Users leaked after churn: {status['pool']['total_users']}")
+        # O(1) read of the maintained counter instead of scanning the pool
+        if status['pool']['running_vms'] != status['pool']['total_vms']:
+            raise Exception("Pool unstable after churn: not all VMs running")
+        print(f"Pool stable: {status['pool']['total_vms']} VMs running, 0 users")
+
+    async def scenario_health_monitoring(self, service):
+        """The monitoring loop should keep VM health data fresh"""
+        # Wait until the base pool is actually provisioned
+        await asyncio.wait_for(
+            service.vm_pool_manager.ready_event.wait(), timeout=30)
+
+        initial_status = await service.get_service_status(ttl_ms=500)
+        print(f"Initial: {initial_status['pool']['total_vms']} VMs")
+
+        # Wait for at least one full monitoring cycle instead of sleeping
+        # a fixed check_interval + slack
+        pool = service.vm_pool_manager
+        start_cycles = pool.monitor_cycles
+        deadline = time.monotonic() + service.config['vm']['check_interval'] + 10
+        while pool.monitor_cycles == start_cycles:
+            if time.monotonic() > deadline:
+                raise Exception("Monitoring loop did not complete a cycle")
+            await asyncio.sleep(0.05)
+
+        final_status = await service.get_service_status()
+        healthy_vms = final_status['pool']['running_vms']
+        print(f"Healthy VMs after monitoring cycle: "
+              f"{healthy_vms}/{final_status['pool']['total_vms']}")
+        if healthy_vms == 0:
+            raise Exception("No healthy VMs after monitoring cycle")
+
+    async def run_comprehensive_test(self):
+        # Basic lifecycle wants a cold pool; the rest only need a reset
+        # and share one pooled service, amortizing its startup cost
+        cold = [("Basic Lifecycle", self.scenario_basic_lifecycle)]
+        warm = [
+            ("Capacity Limits", self.scenario_capacity_limits),
+            ("Error Recovery", self.scenario_error_recovery),
+            ("Health Monitoring", self.scenario_health_monitoring),
+        ]
+        scenarios = cold + warm
+
+        async def run_warm():
+            # Warm scenarios share state, so they run in order
+            for name, scenario_func in warm:
+                await self.run_scenario(name, scenario_func,
+                                        reset_between=False)
+
+        try:
+            # The cold scenario is independent and runs concurrently with
+            # the warm chain
+            await asyncio.gather(
+                *(self.run_scenario(name, scenario_func)
+                  for name, scenario_func in cold),
+                run_warm())
+        finally:
+            await self.teardown_service()
+
+        print(f"\n{'=' * 60}")
+        print("Test Summary")
+        print('=' * 60)
+        for name, _ in scenarios:
+            print(f"  {name}: {self.results[name]}")
+        return all(result == 'PASSED' for result in self.results.values())
+
+
+if __name__ == "__main__":
+    try:
+        # C-accelerated event loop; cuts per-task overhead for the many
+        # small tasks the gather-heavy scenarios create
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    write_test_config()
+    config_ok, cfg = validate_config()
+    if not config_ok:
+        raise SystemExit(1)
+    ok = asyncio.run(TestScenarioRunner(config=cfg).run_comprehensive_test())
+    raise SystemExit(0 if ok else 1)
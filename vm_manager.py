@@ -6,23 +6,39 @@ Manages VM pool based on user load with automatic scaling
 
 import asyncio
 import aiohttp
+import heapq
 import json
+from collections import Counter, deque
 import logging
+import logging.handlers
+import queue
+import ssl
 import time
 import ipaddress
 from typing import Dict, List, Optional, Set
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 import os
 from pathlib import Path
 
+try:
+    # C JSON codec; config and pool-state files are decoded/encoded
+    # noticeably faster and without a text-mode round trip
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps  # returns bytes
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+
 class VMStatus(Enum):
     CREATING = "creating"
     RUNNING = "running"
     STOPPED = "stopped"
     ERROR = "error"
 
-@dataclass
+@dataclass(slots=True)
 class VMInfo:
     id: int
     name: str
@@ -32,11 +48,20 @@ class VMInfo:
     created_at: float = None
     user_count: int = 0
     last_health_check: float = None
-    
+
     def to_dict(self):
-        result = asdict(self)
-        result['status'] = self.status.value
-        return result
+        # Explicit field list instead of asdict(), which walks the fields
+        # reflectively and deep-copies on every status call
+        return {
+            'id': self.id,
+            'name': self.name,
+            'ip': self.ip,
+            'status': self.status.value,
+            'guacamole_connection_id': self.guacamole_connection_id,
+            'created_at': self.created_at,
+            'user_count': self.user_count,
+            'last_health_check': self.last_health_check,
+        }
 
 class ConfigManager:
     """Manages configuration loading and validation"""
@@ -48,8 +73,8 @@ class ConfigManager:
     def load_config(self) -> Dict:
         """Load configuration from JSON file"""
         try:
-            with open(self.config_path, 'r') as f:
-                self.config = json.load(f)
+            with open(self.config_path, 'rb') as f:
+                self.config = _json_loads(f.read())
             self._validate_config()
             return self.config
         except FileNotFoundError:
@@ -84,11 +109,55 @@ class ProxmoxManager:
         self.auth_ticket = None
         self.csrf_token = None
         self.session = None
+        # Precomputed per-call constants; these strings and dicts were
+        # being rebuilt on every request
+        self._node_prefix = f"/api2/json/nodes/{config['proxmox']['node']}"
+        self._base_headers = {}
+        # Built once; passing ssl=bool per request makes aiohttp rebuild
+        # its SSL handling on every call
+        if config['proxmox'].get('verify_ssl', False):
+            self._ssl = ssl.create_default_context()
+        else:
+            self._ssl = False
+        # Short-TTL status cache plus single-flight futures so concurrent
+        # callers coalesce onto one /status/current request per VM
+        self._status_cache: Dict[int, tuple] = {}
+        self._status_inflight: Dict[int, asyncio.Future] = {}
+        self._status_ttl = 1.0
+        # Bounds concurrent clone/config/start sequences so parallel pool
+        # scale-ups don't thrash the storage backend
+        self._clone_sem = asyncio.Semaphore(
+            config['proxmox'].get('max_concurrent_clones', 4))
+        self._refresh_task = None
 
     async def initialize(self):
         """Initialize session and authenticate"""
-        self.session = aiohttp.ClientSession()
+        # Pooled keep-alive connections so parallel clone/status bursts
+        # amortize TLS handshakes and DNS lookups
+        connector = aiohttp.TCPConnector(
+            limit=64,
+            limit_per_host=32,
+            keepalive_timeout=75,
+            ttl_dns_cache=300,
+            ssl=self._ssl
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
         await self.authenticate()
+        # Proxmox tickets expire after 2 hours; refresh proactively so no
+        # user-facing request ever pays the re-auth round trip
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        """Re-authenticate at 75% of the ticket lifetime"""
+        while True:
+            await asyncio.sleep(90 * 60)
+            try:
+                await self.authenticate()
+            except Exception as e:
+                self.logger.error("Scheduled Proxmox re-auth failed: %s", e)
 
     async def authenticate(self):
         """Authenticate with Proxmox API"""
@@ -100,111 +169,172 @@ class ProxmoxManager:
             
             async with self.session.post(
                 f"{self.base_url}/api2/json/access/ticket",
-                data=auth_data,
-                ssl=self.config['proxmox'].get('verify_ssl', False)
+                data=auth_data
             ) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = _json_loads(await response.read())
                     self.auth_ticket = data['data']['ticket']
                     self.csrf_token = data['data']['CSRFPreventionToken']
+                    self._base_headers = {
+                        'Cookie': f'PVEAuthCookie={self.auth_ticket}',
+                        'CSRFPreventionToken': self.csrf_token
+                    }
                     self.logger.info("Successfully authenticated with Proxmox")
                 else:
                     text = await response.text()
                     raise Exception(f"Authentication failed: {response.status} - {text}")
         except Exception as e:
-            self.logger.error(f"Proxmox authentication failed: {e}")
+            self.logger.error("Proxmox authentication failed: %s", e)
             raise
 
-    async def clone_vm(self, template_vm_id: int, new_vm_id: int, name: str, ip_config: Dict) -> bool:
-        """Clone VM from template"""
+    async def clone_vm(self, template_vm_id: int, new_vm_id: int, name: str, ip_config: Dict) -> Optional[str]:
+        """Clone VM from template
+
+        Returns the UPID of the clone task on success (truthy, so boolean
+        callers keep working), None on failure.
+        """
         try:
-            # Clone VM
-            clone_data = {
-                'newid': new_vm_id,
-                'name': name,
-                'full': 1,
-                'target': self.config['proxmox']['node']
-            }
-            
-            await self._make_request(
-                'POST',
-                f"/api2/json/nodes/{self.config['proxmox']['node']}/qemu/{template_vm_id}/clone",
-                data=clone_data
-            )
-            
-            self.logger.info(f"VM {new_vm_id} cloned successfully")
-            
-            # Configure network (using cloud-init)
-            network_config = {
-                'ipconfig0': f"ip={ip_config['ip']}/24,gw={ip_config['gateway']}",
-                'nameserver': ip_config['dns'],
-                'ciuser': ip_config.get('username', 'user'),
-                'cipassword': ip_config.get('password', 'password')
-            }
-            
-            await self._make_request(
-                'POST',
-                f"/api2/json/nodes/{self.config['proxmox']['node']}/qemu/{new_vm_id}/config",
-                data=network_config
-            )
-            
-            # Start VM
-            await self.start_vm(new_vm_id)
-            
-            return True
+            async with self._clone_sem:
+                # Clone VM
+                clone_data = {
+                    'newid': new_vm_id,
+                    'name': name,
+                    'full': 1,
+                    'target': self.config['proxmox']['node']
+                }
+                
+                response = await self._make_request(
+                    'POST',
+                    f"{self._node_prefix}/qemu/{template_vm_id}/clone",
+                    data=clone_data
+                )
+                upid = response.get('data')
+                
+                # The clone endpoint returns immediately with a task UPID; the
+                # VM config is locked until the task finishes
+                if upid and not await self.wait_task(upid):
+                    raise Exception(f"Clone task {upid} failed")
+                
+                self.logger.info("VM %s cloned successfully", new_vm_id)
+                
+                # Configure network (using cloud-init)
+                network_config = {
+                    'ipconfig0': f"ip={ip_config['ip']}/24,gw={ip_config['gateway']}",
+                    'nameserver': ip_config['dns'],
+                    'ciuser': ip_config.get('username', 'user'),
+                    'cipassword': ip_config.get('password', 'password')
+                }
+                
+                await self._make_request(
+                    'POST',
+                    f"{self._node_prefix}/qemu/{new_vm_id}/config",
+                    data=network_config
+                )
+                
+                # Start VM
+                await self.start_vm(new_vm_id)
+                
+                self._status_cache.pop(new_vm_id, None)
+                return upid
             
         except Exception as e:
-            self.logger.error(f"Failed to clone VM {new_vm_id}: {e}")
-            return False
+            self.logger.error("Failed to clone VM %s: %s", new_vm_id, e)
+            return None
 
-    async def start_vm(self, vm_id: int) -> bool:
-        """Start VM"""
+    async def start_vm(self, vm_id: int) -> Optional[str]:
+        """Start VM; returns the start task's UPID on success"""
         try:
-            await self._make_request(
+            response = await self._make_request(
                 'POST',
-                f"/api2/json/nodes/{self.config['proxmox']['node']}/qemu/{vm_id}/status/start"
+                f"{self._node_prefix}/qemu/{vm_id}/status/start"
             )
-            self.logger.info(f"VM {vm_id} started")
-            return True
+            self._status_cache.pop(vm_id, None)
+            self.logger.info("VM %s started", vm_id)
+            return response.get('data')
         except Exception as e:
-            self.logger.error(f"Failed to start VM {vm_id}: {e}")
-            return False
+            self.logger.error("Failed to start VM %s: %s", vm_id, e)
+            return None
 
     async def stop_vm(self, vm_id: int) -> bool:
         """Stop VM"""
         try:
             await self._make_request(
                 'POST',
-                f"/api2/json/nodes/{self.config['proxmox']['node']}/qemu/{vm_id}/status/stop"
+                f"{self._node_prefix}/qemu/{vm_id}/status/stop"
             )
-            self.logger.info(f"VM {vm_id} stopped")
+            self._status_cache.pop(vm_id, None)
+            self.logger.info("VM %s stopped", vm_id)
             return True
         except Exception as e:
-            self.logger.error(f"Failed to stop VM {vm_id}: {e}")
+            self.logger.error("Failed to stop VM %s: %s", vm_id, e)
             return False
 
+    async def wait_task(self, upid: str, timeout: Optional[float] = None) -> bool:
+        """Poll a Proxmox task until it finishes or the timeout expires
+
+        Uses exponential backoff (0.5s doubling to a 5s cap) so short
+        tasks are noticed quickly without hammering the API on long ones.
+        Returns False if the task is still running at the deadline, so a
+        hung task can't pin callers (or the clone semaphore) forever.
+        """
+        if timeout is None:
+            timeout = self.config.get('monitoring', {}).get('vm_ready_timeout', 300)
+        deadline = time.monotonic() + timeout
+        delay = 0.5
+        while True:
+            response = await self._make_request(
+                'GET',
+                f"{self._node_prefix}/tasks/{upid}/status"
+            )
+            task = response.get('data', {})
+            if task.get('status') != 'running':
+                return task.get('exitstatus') == 'OK'
+            if time.monotonic() + delay > deadline:
+                self.logger.error("Task %s did not finish within %ss", upid, timeout)
+                return False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5)
+
     async def get_vm_status(self, vm_id: int) -> Dict:
-        """Get VM status"""
+        """Get VM status, cached for a short TTL with request coalescing"""
+        cached = self._status_cache.get(vm_id)
+        if cached and time.monotonic() - cached[0] < self._status_ttl:
+            return cached[1]
+        
+        # If another caller is already fetching this VM's status, share
+        # its result instead of duplicating the request
+        inflight = self._status_inflight.get(vm_id)
+        if inflight is not None:
+            return await inflight
+        
+        future = asyncio.get_running_loop().create_future()
+        self._status_inflight[vm_id] = future
         try:
             response = await self._make_request(
                 'GET',
-                f"/api2/json/nodes/{self.config['proxmox']['node']}/qemu/{vm_id}/status/current"
+                f"{self._node_prefix}/qemu/{vm_id}/status/current"
             )
-            return response['data']
+            status = response['data']
+            self._status_cache[vm_id] = (time.monotonic(), status)
+            future.set_result(status)
+            return status
         except Exception as e:
-            self.logger.error(f"Failed to get status for VM {vm_id}: {e}")
+            self.logger.error("Failed to get status for VM %s: %s", vm_id, e)
+            future.set_result({})
             return {}
+        finally:
+            del self._status_inflight[vm_id]
 
     async def list_vms(self) -> List[Dict]:
         """List all VMs"""
         try:
             response = await self._make_request(
                 'GET',
-                f"/api2/json/nodes/{self.config['proxmox']['node']}/qemu"
+                f"{self._node_prefix}/qemu"
             )
             return response['data']
         except Exception as e:
-            self.logger.error(f"Failed to list VMs: {e}")
+            self.logger.error("Failed to list VMs: %s", e)
             return []
 
     async def _make_request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
@@ -212,29 +342,32 @@ class ProxmoxManager:
         if not self.auth_ticket:
             await self.authenticate()
 
-        headers = {
-            'Cookie': f'PVEAuthCookie={self.auth_ticket}',
-            'CSRFPreventionToken': self.csrf_token
-        }
-        
-        if data:
-            headers['Content-Type'] = 'application/json'
-        
-        async with self.session.request(
-            method,
-            f"{self.base_url}{endpoint}",
-            headers=headers,
-            json=data,
-            ssl=self.config['proxmox'].get('verify_ssl', False)
-        ) as response:
-            if response.status == 200:
-                return await response.json()
+        for attempt in range(2):
+            if data:
+                headers = dict(self._base_headers)
+                headers['Content-Type'] = 'application/json'
             else:
+                headers = self._base_headers
+            
+            async with self.session.request(
+                method,
+                f"{self.base_url}{endpoint}",
+                headers=headers,
+                json=data
+            ) as response:
+                if response.status == 200:
+                    return _json_loads(await response.read())
+                if response.status == 401 and attempt == 0:
+                    # Expired ticket: refresh once and retry transparently
+                    await self.authenticate()
+                    continue
                 text = await response.text()
                 raise Exception(f"API request failed: {response.status} - {text}")
 
     async def close(self):
         """Close session"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
         if self.session:
             await self.session.close()
 
@@ -245,11 +378,43 @@ class GuacamoleManager:
         self.base_url = config['guacamole']['host']
         self.auth_token = None
         self.session = None
+        # Precomputed endpoint roots and header templates, refreshed on
+        # re-auth instead of rebuilt per call
+        data_source = config['guacamole'].get('data_source', 'mysql')
+        self._session_url = f"{self.base_url}/api/session/data/{data_source}"
+        self._auth_headers = {}
+        self._json_headers = {}
+        # Per-connection usage counts, rebuilt at most once per TTL from a
+        # single activeConnections fetch instead of one fetch per VM
+        self._usage_counts = None
+        self._usage_cache_ts = 0.0
+        self._usage_cache_ttl = 2.0
+        self._refresh_task = None
 
     async def initialize(self):
         """Initialize session and authenticate"""
-        self.session = aiohttp.ClientSession()
+        connector = aiohttp.TCPConnector(
+            limit=64,
+            limit_per_host=32,
+            keepalive_timeout=75,
+            ttl_dns_cache=300
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=30)
+        )
         await self.authenticate()
+        # Guacamole tokens expire after ~1 hour; refresh before then
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        """Re-authenticate at 75% of the token lifetime"""
+        while True:
+            await asyncio.sleep(45 * 60)
+            try:
+                await self.authenticate()
+            except Exception as e:
+                self.logger.error("Scheduled Guacamole re-auth failed: %s", e)
 
     async def authenticate(self):
         """Authenticate with Guacamole API"""
@@ -264,14 +429,19 @@ class GuacamoleManager:
                 data=auth_data
             ) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = _json_loads(await response.read())
                     self.auth_token = data['authToken']
+                    self._auth_headers = {'Guacamole-Token': self.auth_token}
+                    self._json_headers = {
+                        'Guacamole-Token': self.auth_token,
+                        'Content-Type': 'application/json'
+                    }
                     self.logger.info("Successfully authenticated with Guacamole")
                 else:
                     text = await response.text()
                     raise Exception(f"Authentication failed: {response.status} - {text}")
         except Exception as e:
-            self.logger.error(f"Guacamole authentication failed: {e}")
+            self.logger.error("Guacamole authentication failed: %s", e)
             raise
 
     async def create_connection(self, vm_config: Dict) -> Optional[str]:
@@ -295,83 +465,78 @@ class GuacamoleManager:
                 }
             }
             
-            headers = {
-                'Guacamole-Token': self.auth_token,
-                'Content-Type': 'application/json'
-            }
-            
-            data_source = self.config['guacamole'].get('data_source', 'mysql')
-            
             async with self.session.post(
-                f"{self.base_url}/api/session/data/{data_source}/connections",
-                headers=headers,
+                f"{self._session_url}/connections",
+                headers=self._json_headers,
                 json=connection_config
             ) as response:
                 if response.status == 200:
-                    data = await response.json()
-                    self.logger.info(f"Guacamole connection created for VM {vm_config['name']}")
+                    data = _json_loads(await response.read())
+                    self.logger.info("Guacamole connection created for VM %s", vm_config['name'])
                     return data['identifier']
                 else:
                     text = await response.text()
                     raise Exception(f"Connection creation failed: {response.status} - {text}")
                     
         except Exception as e:
-            self.logger.error(f"Failed to create Guacamole connection: {e}")
+            self.logger.error("Failed to create Guacamole connection: %s", e)
             return None
 
     async def delete_connection(self, connection_id: str) -> bool:
         """Delete Guacamole connection"""
         try:
-            headers = {'Guacamole-Token': self.auth_token}
-            data_source = self.config['guacamole'].get('data_source', 'mysql')
-            
             async with self.session.delete(
-                f"{self.base_url}/api/session/data/{data_source}/connections/{connection_id}",
-                headers=headers
+                f"{self._session_url}/connections/{connection_id}",
+                headers=self._auth_headers
             ) as response:
                 if response.status == 204:
-                    self.logger.info(f"Guacamole connection {connection_id} deleted")
+                    self.logger.info("Guacamole connection %s deleted", connection_id)
                     return True
                 else:
                     return False
                     
         except Exception as e:
-            self.logger.error(f"Failed to delete Guacamole connection: {e}")
+            self.logger.error("Failed to delete Guacamole connection: %s", e)
             return False
 
     async def get_active_connections(self) -> Dict:
         """Get active connections"""
         try:
-            headers = {'Guacamole-Token': self.auth_token}
-            data_source = self.config['guacamole'].get('data_source', 'mysql')
-            
             async with self.session.get(
-                f"{self.base_url}/api/session/data/{data_source}/activeConnections",
-                headers=headers
+                f"{self._session_url}/activeConnections",
+                headers=self._auth_headers
             ) as response:
                 if response.status == 200:
-                    return await response.json()
+                    return _json_loads(await response.read())
                 else:
                     return {}
         except Exception as e:
-            self.logger.error(f"Failed to get active connections: {e}")
+            self.logger.error("Failed to get active connections: %s", e)
             return {}
 
+    async def refresh_connection_usage(self) -> Dict:
+        """Fetch active connections once and bucket counts per connection"""
+        active = await self.get_active_connections()
+        self._usage_counts = Counter(
+            conn.get('connectionIdentifier') for conn in active.values())
+        self._usage_cache_ts = time.monotonic()
+        return self._usage_counts
+
     async def get_connection_usage(self, connection_id: str) -> int:
         """Get number of active users for connection"""
         try:
-            active_connections = await self.get_active_connections()
-            count = 0
-            for conn in active_connections.values():
-                if conn.get('connectionIdentifier') == connection_id:
-                    count += 1
-            return count
+            if (self._usage_counts is None or
+                    time.monotonic() - self._usage_cache_ts >= self._usage_cache_ttl):
+                await self.refresh_connection_usage()
+            return self._usage_counts.get(connection_id, 0)
         except Exception as e:
-            self.logger.error(f"Failed to get connection usage: {e}")
+            self.logger.error("Failed to get connection usage: %s", e)
             return 0
 
     async def close(self):
         """Close session"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
         if self.session:
             await self.session.close()
 
@@ -385,71 +550,187 @@ class VMPoolManager:
         self.vm_pool: Dict[int, VMInfo] = {}
         self.available_vms: Set[int] = set()
         self.next_vm_id = 100
-        self.ip_pool = self._initialize_ip_pool()
+        # deque gives O(1) popleft; the set makes the duplicate check in
+        # release_ip O(1) instead of a linear scan
+        self.ip_pool = deque(self._initialize_ip_pool())
+        self._ip_set = set(self.ip_pool)
+        # Min-heap of (user_count, vm_id) with lazy deletion, so best-fit
+        # assignment is O(log N) instead of a scan over available_vms
+        self._avail_heap: List[tuple] = []
         
         self.monitoring_task = None
+        # All long-lived tasks owned by the pool, so shutdown can cancel
+        # and await them as a group
+        self._background_tasks: Set[asyncio.Task] = set()
         self.is_running = False
+        self._state_path = config['vm'].get('state_file', 'pool_state.json')
+        # Serialized pool status is rebuilt only after a mutation; polling
+        # dashboards otherwise get the cached snapshot back
+        self._pool_dirty = True
+        self._pool_status_cache = None
+        # Signalled once the base pool is provisioned, so callers can wait
+        # for readiness instead of sleeping a guessed amount of time
+        self.ready_event = asyncio.Event()
+        self.monitor_cycles = 0
+        # Consecutive all-green, no-activity ticks; drives the adaptive
+        # monitoring interval
+        self._idle_ticks = 0
+        # Maintained on every status transition so status consumers get an
+        # O(1) healthy-VM count instead of scanning the pool
+        self.running_count = 0
+
+    def _push_available(self, vm_info: VMInfo):
+        """Record a VM's current user_count in the availability heap"""
+        heapq.heappush(self._avail_heap, (vm_info.user_count, vm_info.id))
+
+    def _set_vm_status(self, vm_info: VMInfo, status: VMStatus):
+        """Update a VM's status, keeping running_count in sync"""
+        if vm_info.status != status:
+            if status == VMStatus.RUNNING:
+                self.running_count += 1
+            elif vm_info.status == VMStatus.RUNNING:
+                self.running_count -= 1
+            vm_info.status = status
+            self._pool_dirty = True
 
     def _initialize_ip_pool(self) -> List[str]:
         """Initialize IP address pool"""
         network = ipaddress.ip_network(self.config['network']['subnet'])
-        base_ip = ipaddress.ip_address(self.config['network']['base_ip'])
-        
-        ips = []
-        current_ip = base_ip
-        for _ in range(self.config['vm']['max_vms']):
-            if current_ip in network:
-                ips.append(str(current_ip))
-                current_ip += 1
-            else:
-                break
-                
-        return ips
+        base = int(ipaddress.ip_address(self.config['network']['base_ip']))
+        net_int = int(network.network_address)
+        mask = int(network.netmask)
+
+        # Integer mask test instead of IPv4Network.__contains__; candidates
+        # past the subnet's edge can never match the network bits again,
+        # so this yields the same contiguous run of addresses
+        return [
+            str(ipaddress.IPv4Address(i))
+            for i in range(base, base + self.config['vm']['max_vms'])
+            if (i & mask) == net_int
+        ]
 
     def get_next_ip(self) -> Optional[str]:
         """Get next available IP address"""
         if self.ip_pool:
-            return self.ip_pool.pop(0)
+            ip = self.ip_pool.popleft()
+            self._ip_set.discard(ip)
+            return ip
         return None
 
     def release_ip(self, ip: str):
         """Release IP address back to pool"""
-        if ip not in self.ip_pool:
+        if ip not in self._ip_set:
             self.ip_pool.append(ip)
+            self._ip_set.add(ip)
 
     async def initialize(self):
         """Initialize managers and ensure base load"""
         await self.proxmox_manager.initialize()
         await self.guacamole_manager.initialize()
+        await self._load_pool_state()
         await self.ensure_base_load()
         
         # Start monitoring
         self.is_running = True
         self.monitoring_task = asyncio.create_task(self._monitoring_loop())
-        
+        self._background_tasks.add(self.monitoring_task)
+
+        self.ready_event.set()
         self.logger.info("VM Pool Manager initialized successfully")
 
+    def _save_pool_state(self):
+        """Persist a pool snapshot so restarts can warm-start
+
+        Written atomically (temp file + os.replace) so a crash mid-write
+        never leaves a truncated state file.
+        """
+        state = [
+            {'id': vm.id, 'name': vm.name, 'ip': vm.ip,
+             'guacamole_connection_id': vm.guacamole_connection_id}
+            for vm in self.vm_pool.values()
+        ]
+        tmp_path = self._state_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_json_dumps(state))
+            os.replace(tmp_path, self._state_path)
+        except OSError as e:
+            self.logger.warning("Failed to persist pool state: %s", e)
+
+    async def _load_pool_state(self):
+        """Warm-start the pool from the persisted snapshot
+
+        Entries are cross-checked against a single list_vms call; VMs
+        still running rejoin the pool without per-VM status probes.
+        """
+        try:
+            with open(self._state_path, 'rb') as f:
+                state = _json_loads(f.read())
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError) as e:
+            self.logger.warning("Ignoring unreadable pool state: %s", e)
+            return
+        
+        running = {vm['vmid'] for vm in await self.proxmox_manager.list_vms()
+                   if vm.get('status') == 'running'}
+        for entry in state:
+            vm_id = entry['id']
+            if vm_id not in running or vm_id in self.vm_pool:
+                continue
+            vm_info = VMInfo(
+                id=vm_id,
+                name=entry['name'],
+                ip=entry['ip'],
+                status=VMStatus.RUNNING,
+                guacamole_connection_id=entry.get('guacamole_connection_id'),
+                created_at=time.time(),
+                user_count=0
+            )
+            self.vm_pool[vm_id] = vm_info
+            self.available_vms.add(vm_id)
+            self._push_available(vm_info)
+            self.running_count += 1
+            self._pool_dirty = True
+            self.next_vm_id = max(self.next_vm_id, vm_id + 1)
+            if entry['ip'] in self._ip_set:
+                self.ip_pool.remove(entry['ip'])
+                self._ip_set.discard(entry['ip'])
+            self.logger.info("Restored VM %s from persisted pool state", vm_id)
+
     async def ensure_base_load(self):
         """Ensure base number of VMs are running"""
         try:
             current_vms = await self.proxmox_manager.list_vms()
             running_vms = [vm for vm in current_vms if vm.get('status') == 'running']
             
-            self.logger.info(f"Found {len(running_vms)} running VMs, target: {self.config['vm']['base_load']}")
+            self.logger.info("Found %s running VMs, target: %s", len(running_vms), self.config['vm']['base_load'])
 
-            # Register existing VMs
-            for vm in running_vms:
-                if vm['vmid'] != self.config['proxmox']['template_vm_id']:
-                    await self._register_existing_vm(vm['vmid'])
+            # Register existing VMs concurrently
+            await asyncio.gather(*(
+                self._register_existing_vm(vm['vmid'])
+                for vm in running_vms
+                if vm['vmid'] != self.config['proxmox']['template_vm_id']
+            ))
 
-            # Create missing VMs
-            for i in range(len(self.vm_pool), self.config['vm']['base_load']):
-                await self.create_vm()
+            # Create missing VMs concurrently; create_vm reserves its VM id
+            # and IP synchronously before the first await, so parallel
+            # creates cannot race on the same id/address
+            missing = self.config['vm']['base_load'] - len(self.vm_pool)
+            if missing > 0:
+                results = await asyncio.gather(
+                    *(self.create_vm() for _ in range(missing)),
+                    return_exceptions=True)
+                for result in results:
+                    if isinstance(result, Exception):
+                        self.logger.error("Base load VM creation failed: %s", result)
         except Exception as e:
-            self.logger.error(f"Failed to ensure base load: {e}")
+            self.logger.error("Failed to ensure base load: %s", e)
 
     async def _register_existing_vm(self, vm_id: int):
         """Register existing VM in the pool"""
+        if vm_id in self.vm_pool:
+            return
         try:
             status = await self.proxmox_manager.get_vm_status(vm_id)
             if status.get('status') == 'running':
@@ -466,11 +747,14 @@ class VMPoolManager:
                 
                 self.vm_pool[vm_id] = vm_info
                 self.available_vms.add(vm_id)
+                self._push_available(vm_info)
+                self.running_count += 1
+                self._pool_dirty = True
                 
-                self.logger.info(f"Registered existing VM {vm_id}")
+                self.logger.info("Registered existing VM %s", vm_id)
                 
         except Exception as e:
-            self.logger.error(f"Failed to register existing VM {vm_id}: {e}")
+            self.logger.error("Failed to register existing VM %s: %s", vm_id, e)
 
     async def create_vm(self) -> Optional[VMInfo]:
         """Create a new VM"""
@@ -508,6 +792,7 @@ class VMPoolManager:
             )
             
             self.vm_pool[vm_id] = vm_info
+            self._pool_dirty = True
 
             # Clone VM
             success = await self.proxmox_manager.clone_vm(
@@ -520,64 +805,99 @@ class VMPoolManager:
             if not success:
                 raise Exception("VM creation failed")
 
-            # Wait for VM to be ready
-            await self._wait_for_vm_ready(vm_id)
-
-            # Create Guacamole connection
-            connection_id = await self.guacamole_manager.create_connection({
-                'name': vm_name,
-                'ip': ip,
-                'username': 'user',
-                'password': 'password'
-            })
+            # The Guacamole connection only depends on knowing the IP, not
+            # on the VM being reachable, so create it concurrently with
+            # the boot wait instead of after it
+            guac_task = asyncio.create_task(
+                self.guacamole_manager.create_connection({
+                    'name': vm_name,
+                    'ip': ip,
+                    'username': 'user',
+                    'password': 'password'
+                }))
+            # Track the task so shutdown can cancel an in-flight create
+            self._background_tasks.add(guac_task)
+            guac_task.add_done_callback(self._background_tasks.discard)
+            try:
+                await self._wait_for_vm_ready(vm_id)
+            except Exception:
+                # The boot wait failed; reap the connection task so the
+                # connection it may have created doesn't leak
+                guac_task.cancel()
+                try:
+                    stale_id = await guac_task
+                except (Exception, asyncio.CancelledError):
+                    stale_id = None
+                if stale_id:
+                    await self.guacamole_manager.delete_connection(stale_id)
+                raise
+            connection_id = await guac_task
             
             if connection_id:
                 vm_info.guacamole_connection_id = connection_id
-                vm_info.status = VMStatus.RUNNING
+                self._set_vm_status(vm_info, VMStatus.RUNNING)
             else:
                 raise Exception("Guacamole connection creation failed")
 
             self.available_vms.add(vm_id)
-            self.logger.info(f"VM {vm_id} created and ready with IP {ip}")
+            self._push_available(vm_info)
+            self._idle_ticks = 0
+            self._save_pool_state()
+            self.logger.info("VM %s created and ready with IP %s", vm_id, ip)
             return vm_info
 
         except Exception as e:
-            self.logger.error(f"Failed to create VM {vm_id}: {e}")
-            vm_info.status = VMStatus.ERROR
+            self.logger.error("Failed to create VM %s: %s", vm_id, e)
+            self._set_vm_status(vm_info, VMStatus.ERROR)
             self.release_ip(ip)
             if vm_id in self.vm_pool:
                 del self.vm_pool[vm_id]
+            self._pool_dirty = True
             return None
 
     async def _wait_for_vm_ready(self, vm_id: int):
         """Wait for VM to be ready"""
-        max_attempts = self.config['monitoring'].get('vm_ready_timeout', 300) // 5
-        for attempt in range(max_attempts):
+        deadline = time.monotonic() + self.config['monitoring'].get('vm_ready_timeout', 300)
+        # Exponential backoff: fast boots are detected in well under a
+        # second while slow ones back off to a 5s poll
+        delay = 0.5
+        while True:
             try:
                 status = await self.proxmox_manager.get_vm_status(vm_id)
                 if status.get('status') == 'running':
-                    self.logger.info(f"VM {vm_id} is ready")
+                    self.logger.info("VM %s is ready", vm_id)
                     return
             except Exception:
                 pass
             
-            await asyncio.sleep(5)
+            if time.monotonic() + delay > deadline:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5)
         
         raise Exception(f"VM {vm_id} failed to become ready within timeout")
 
     async def assign_vm_to_user(self) -> Optional[VMInfo]:
         """Assign a VM to a user"""
-        # Find available VM with lowest user count
-        best_vm = None
-        min_users = float('inf')
+        users_per_vm = self.config['vm']['users_per_vm']
         
-        for vm_id in self.available_vms:
-            vm_info = self.vm_pool[vm_id]
-            if (vm_info.status == VMStatus.RUNNING and 
-                vm_info.user_count < min_users and 
-                vm_info.user_count < self.config['vm']['users_per_vm']):
-                best_vm = vm_info
-                min_users = vm_info.user_count
+        # Pop the heap down to the available VM with the lowest user
+        # count, lazily discarding entries whose recorded count or
+        # availability went stale since they were pushed
+        best_vm = None
+        while self._avail_heap:
+            user_count, vm_id = self._avail_heap[0]
+            vm_info = self.vm_pool.get(vm_id)
+            if (vm_info is None or
+                vm_id not in self.available_vms or
+                vm_info.status != VMStatus.RUNNING or
+                vm_info.user_count != user_count or
+                vm_info.user_count >= users_per_vm):
+                heapq.heappop(self._avail_heap)
+                continue
+            heapq.heappop(self._avail_heap)
+            best_vm = vm_info
+            break
         
         if not best_vm:
             # No available VM, create a new one
@@ -588,12 +908,15 @@ class VMPoolManager:
         # Update user count
         best_vm.user_count += 1
         self.vm_pool[best_vm.id] = best_vm
+        self._pool_dirty = True
         
         # Remove from available if at capacity
-        if best_vm.user_count >= self.config['vm']['users_per_vm']:
+        if best_vm.user_count >= users_per_vm:
             self.available_vms.discard(best_vm.id)
+        else:
+            self._push_available(best_vm)
         
-        self.logger.info(f"Assigned VM {best_vm.id} to user (total users: {best_vm.user_count})")
+        self.logger.info("Assigned VM %s to user (total users: %s)", best_vm.id, best_vm.user_count)
         return best_vm
 
     async def release_vm_from_user(self, vm_id: int):
@@ -602,99 +925,210 @@ class VMPoolManager:
             vm_info = self.vm_pool[vm_id]
             if vm_info.user_count > 0:
                 vm_info.user_count -= 1
+                self._pool_dirty = True
                 
+                self._idle_ticks = 0
                 # Add back to available if not at capacity
                 if vm_info.user_count < self.config['vm']['users_per_vm']:
                     self.available_vms.add(vm_id)
+                    self._push_available(vm_info)
                 
-                self.logger.info(f"Released user from VM {vm_id} (remaining users: {vm_info.user_count})")
+                self.logger.info("Released user from VM %s (remaining users: %s)", vm_id, vm_info.user_count)
 
     async def get_pool_status(self) -> Dict:
-        """Get current pool status"""
-        total_vms = len(self.vm_pool)
-        available_vms = len(self.available_vms)
-        total_users = sum(vm.user_count for vm in self.vm_pool.values())
+        """Get current pool status
+
+        The snapshot is rebuilt only when a mutation has marked the pool
+        dirty since the last call; otherwise the cached dict is returned
+        as-is.
+        """
+        if not self._pool_dirty and self._pool_status_cache is not None:
+            return self._pool_status_cache
         
-        return {
-            'total_vms': total_vms,
-            'available_vms': available_vms,
-            'total_users': total_users,
+        status = {
+            'total_vms': len(self.vm_pool),
+            'available_vms': len(self.available_vms),
+            'running_vms': self.running_count,
+            'total_users': sum(vm.user_count for vm in self.vm_pool.values()),
             'vms': [vm.to_dict() for vm in self.vm_pool.values()]
         }
+        self._pool_status_cache = status
+        self._pool_dirty = False
+        return status
 
     async def _monitoring_loop(self):
-        """Monitor and manage VM pool"""
+        """Monitor and manage VM pool
+
+        The polling interval doubles while the pool stays all-green and
+        idle (capped at 4x check_interval) and snaps back to the base
+        cadence on any health change or create/release activity.
+        """
         while self.is_running:
             try:
                 if self.config['monitoring'].get('enable_health_checks', True):
-                    await self._check_vm_health()
+                    # One activeConnections fetch serves every usage lookup
+                    # made during this tick
+                    await self.guacamole_manager.refresh_connection_usage()
+                    all_green = await self._check_vm_health()
+                    if all_green:
+                        # Cap the counter itself: 2 doublings already hit
+                        # the 4x ceiling, and an unbounded exponent would
+                        # grow a useless bignum on a long-idle service
+                        self._idle_ticks = min(self._idle_ticks + 1, 2)
+                    else:
+                        self._idle_ticks = 0
                 await self._scale_pool_based_on_load()
-                await asyncio.sleep(self.config['vm']['check_interval'])
+                self.monitor_cycles += 1
+                base = self.config['vm']['check_interval']
+                interval = base * (2 ** self._idle_ticks)
+                await asyncio.sleep(interval)
             except Exception as e:
-                self.logger.error(f"Error in monitoring loop: {e}")
+                self.logger.error("Error in monitoring loop: %s", e)
                 await asyncio.sleep(5)
 
-    async def _check_vm_health(self):
-        """Check health of all VMs"""
+    async def _check_vm_health(self) -> bool:
+        """Check health of all VMs; returns True when all are running"""
+        # One /qemu listing covers every pool VM; the per-VM
+        # /status/current round trips are unnecessary here
+        try:
+            vms = await self.proxmox_manager.list_vms()
+        except Exception as e:
+            self.logger.error("Health check listing failed: %s", e)
+            return False
+        by_id = {vm['vmid']: vm for vm in vms}
+
+        now = time.time()
+        all_green = True
         for vm_id, vm_info in list(self.vm_pool.items()):
-            try:
-                status = await self.proxmox_manager.get_vm_status(vm_id)
-                if status.get('status') != 'running':
-                    vm_info.status = VMStatus.STOPPED
-                    self.available_vms.discard(vm_id)
-                    self.logger.warning(f"VM {vm_id} is not running")
-                else:
-                    vm_info.status = VMStatus.RUNNING
-                    vm_info.last_health_check = time.time()
-            except Exception as e:
-                self.logger.error(f"Health check failed for VM {vm_id}: {e}")
+            if by_id.get(vm_id, {}).get('status') != 'running':
+                all_green = False
+                self._set_vm_status(vm_info, VMStatus.STOPPED)
+                self.available_vms.discard(vm_id)
+                self.logger.warning("VM %s is not running", vm_id)
+            else:
+                self._set_vm_status(vm_info, VMStatus.RUNNING)
+                vm_info.last_health_check = now
+                self._pool_dirty = True
+        return all_green
 
     async def _scale_pool_based_on_load(self):
         """Scale VM pool based on current load"""
         total_users = sum(vm.user_count for vm in self.vm_pool.values())
         available_capacity = len(self.available_vms) * self.config['vm']['users_per_vm']
         
-        # If we're running low on capacity, create more VMs
-        if (available_capacity < 2 and 
+        # If we're running low on capacity, create more VMs as one batch
+        # instead of one per monitoring interval
+        if (available_capacity < 2 and
             len(self.vm_pool) < self.config['vm']['max_vms']):
-            self.logger.info("Low capacity detected, creating additional VM")
-            await self.create_vm()
+            users_per_vm = self.config['vm']['users_per_vm']
+            shortfall = 2 - available_capacity
+            batch = min(-(-shortfall // users_per_vm),
+                        self.config['vm']['max_vms'] - len(self.vm_pool))
+            self.logger.info("Low capacity detected, creating %s additional VM(s)", batch)
+            await asyncio.gather(*(self.create_vm() for _ in range(batch)),
+                                 return_exceptions=True)
+
+    async def reset(self):
+        """Reset pool state: drop all user assignments and prune VMs
+        beyond the configured base load
+
+        Used by callers that reuse one service across runs (e.g. test
+        fixtures) instead of paying a full shutdown/initialize cycle.
+        """
+        keep = set(sorted(self.vm_pool)[:self.config['vm']['base_load']])
+        self._avail_heap.clear()
+        self._pool_dirty = True
+        for vm_id, vm_info in list(self.vm_pool.items()):
+            vm_info.user_count = 0
+            if vm_id in keep:
+                self.available_vms.add(vm_id)
+                self._push_available(vm_info)
+                continue
+            if vm_info.status == VMStatus.RUNNING:
+                self.running_count -= 1
+            self.available_vms.discard(vm_id)
+            if vm_info.guacamole_connection_id:
+                await self.guacamole_manager.delete_connection(
+                    vm_info.guacamole_connection_id)
+            # Actually stop the VM before reclaiming its address, so the
+            # released IP can't be handed to a new VM while the old one
+            # is still using it
+            await self.proxmox_manager.stop_vm(vm_id)
+            self.release_ip(vm_info.ip)
+            del self.vm_pool[vm_id]
+        self._save_pool_state()
 
     async def shutdown(self):
-        """Shutdown the VM pool manager"""
+        """Shutdown the VM pool manager
+
+        Cancels and awaits every tracked background task, then closes
+        both API sessions concurrently so shutdown costs max(closes)
+        rather than their sum.
+        """
         self.is_running = False
-        if self.monitoring_task:
-            self.monitoring_task.cancel()
-            try:
-                await self.monitoring_task
-            except asyncio.CancelledError:
-                pass
+        pending = [t for t in self._background_tasks if not t.done()]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._background_tasks.clear()
         
-        await self.proxmox_manager.close()
-        await self.guacamole_manager.close()
+        results = await asyncio.gather(
+            self.proxmox_manager.close(),
+            self.guacamole_manager.close(),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error("Manager close failed: %s", result)
 
 class DynamicVMService:
-    def __init__(self, config_path: str = "config.json"):
+    def __init__(self, config_path: str = "config.json", config: Dict = None):
         self.config_manager = ConfigManager(config_path)
-        self.config = self.config_manager.load_config()
+        if config is not None:
+            # Caller already parsed (and validated) the config; skip the
+            # redundant file read
+            self.config = self.config_manager.config = config
+        else:
+            self.config = self.config_manager.load_config()
         self.setup_logging()
         self.vm_pool_manager = VMPoolManager(self.config, self.logger)
         self.is_running = False
+        self._status_cache = None
 
     def setup_logging(self):
-        """Setup logging configuration"""
+        """Setup logging configuration
+
+        Records are funnelled through a queue to a listener thread, so
+        file and stream I/O never blocks the event loop.
+        """
+        self._log_listener = None
+        self._queue_handler = None
+        self.logger = logging.getLogger('DynamicVMService')
+
+        # Respect whatever the host process already configured; only the
+        # first service in an unconfigured process installs handlers
+        root = logging.getLogger()
+        if root.handlers:
+            return
+
         log_level = getattr(logging, self.config['server'].get('log_level', 'INFO'))
         log_file = self.config['server'].get('log_file', 'vm_service.log')
-        
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger('DynamicVMService')
+
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler(log_file)
+        stream_handler = logging.StreamHandler()
+        file_handler.setFormatter(formatter)
+        stream_handler.setFormatter(formatter)
+
+        log_queue = queue.Queue(-1)
+        root.setLevel(log_level)
+        self._queue_handler = logging.handlers.QueueHandler(log_queue)
+        root.addHandler(self._queue_handler)
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, stream_handler,
+            respect_handler_level=True)
+        self._log_listener.start()
 
     async def start(self):
         """Start the service"""
@@ -708,7 +1142,7 @@ class DynamicVMService:
                 await asyncio.sleep(1)
                 
         except Exception as e:
-            self.logger.error(f"Failed to start service: {e}")
+            self.logger.error("Failed to start service: %s", e)
             raise
         finally:
             await self.stop()
@@ -718,6 +1152,13 @@ class DynamicVMService:
         self.is_running = False
         await self.vm_pool_manager.shutdown()
         self.logger.info("Dynamic VM Service stopped")
+        if self._log_listener is not None:
+            # Flush queued records and detach our handler so nothing logs
+            # into an undrained queue afterwards
+            logging.getLogger().removeHandler(self._queue_handler)
+            self._log_listener.stop()
+            self._log_listener = None
+            self._queue_handler = None
 
     async def assign_user_vm(self) -> Optional[Dict]:
         """Assign a VM to a user"""
@@ -735,13 +1176,31 @@ class DynamicVMService:
         """Release a VM from user"""
         await self.vm_pool_manager.release_vm_from_user(vm_id)
 
-    async def get_service_status(self) -> Dict:
-        """Get service status"""
+    async def reset(self):
+        """Reset the VM pool to its base state without restarting"""
+        await self.vm_pool_manager.reset()
+        self._status_cache = None
+
+    async def get_service_status(self, ttl_ms: int = 0) -> Dict:
+        """Get service status
+
+        When ttl_ms > 0, a snapshot no older than ttl_ms is returned if
+        available, so polling callers don't walk the pool on every read.
+        The default keeps full freshness.
+        """
+        if ttl_ms > 0 and self._status_cache:
+            fetched_at, snapshot = self._status_cache
+            if (time.monotonic_ns() - fetched_at) / 1e6 < ttl_ms:
+                return snapshot
+
         pool_status = await self.vm_pool_manager.get_pool_status()
-        return {
+        snapshot = {
             'status': 'running' if self.is_running else 'stopped',
             'pool': pool_status
         }
+        # Stamp after the query completes so the TTL reflects data age
+        self._status_cache = (time.monotonic_ns(), snapshot)
+        return snapshot
 
 async def main():
     """Main function"""